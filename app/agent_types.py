@@ -1,5 +1,6 @@
 from typing import TypedDict, List, Annotated
-import operator
+
+from app.sources import Source, merge_sources
 
 class ResearchResult(TypedDict):
     title: str
@@ -10,8 +11,9 @@ class ResearchResult(TypedDict):
 
 class AgentState(TypedDict):
     task: str                                               # The user's initial question
-    content: Annotated[List[ResearchResult], operator.add]  # A list of research results gather so far
+    content: Annotated[List[Source], merge_sources]         # Research results gathered so far (shared Source references)
+    notes: List[str]                                        # Condensed, cited notes per source batch (optional summarizer stage)
     draft: str                                              # The current version of the report
     critique: str                                           # Feedback from the critique agent
     revision_number: int                                    # The current revision number
-    last_action: str                                        # To store the critic's decision (RESEARCH_MORE, REWRITE, APPROVE)
\ No newline at end of file
+    last_action: str                                        # To store the critic's decision (RESEARCH_MORE, REWRITE, APPROVE)
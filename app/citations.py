@@ -0,0 +1,38 @@
+CITATION_FORMATS = ["IEEE", "APA", "BibTeX"]
+
+def reference_rows(refs):
+    """Build the rows for the references table."""
+    ref_data = []
+    for i, item in enumerate(refs, 1):
+        ref_data.append({
+            "No": i,
+            "Year": item.get("year", "n.d."),
+            "Author": item.get("author", "Unknown"),
+            "Title": item.get("title", 'Unknown'),
+            "Source": item.get("source", "")
+        })
+    return ref_data
+
+def format_citations(refs, citation_format):
+    """Render the reference list as IEEE, APA or BibTeX text."""
+    entries = []
+    for i, item in enumerate(refs, 1):
+        title = item.get("title", "Unknown Title")
+        year = item.get("year", "n.d.")
+        author = item.get("author", "Unknown Author")
+        url = item.get("source", "")
+
+        if citation_format == "APA":
+            entries.append(f"{i}. {author}. ({year}). _{title}_. Retrieved from {url}\n\n")
+        elif citation_format == "IEEE":
+            entries.append(f"[{i}]. {author}, \"{title},\" {year}. [Online]. Available: {url}.\n\n")
+        elif citation_format == "BibTeX":
+            clean_author = author.split()[0].lower() if author else "unknown"
+            cit_key = f"{clean_author}{year}{i}"
+            entries.append(f"""@misc{{{cit_key},
+        author = {{{author}}},
+        title = {{{title}}},
+        year = {{{year}}},
+        howpublished = {{\\url{{{url}}}}}
+}}\n\n""")
+    return "".join(entries)
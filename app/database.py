@@ -22,15 +22,17 @@ def init_db():
     conn.close()
 
 def save_research(topic, report, references):
-    """Save a research session to the database."""
+    """Save a research session to the database. Returns the new row id."""
     conn = sqlite3.connect(DB_FILE)
     c = conn.cursor()
     # References should be a list of dicts, we serialize it to JSON string
     ref_json = json.dumps(references)
     c.execute('INSERT INTO history (topic, report, references_json) VALUES (?, ?, ?)', 
               (topic, report, ref_json))
+    report_id = c.lastrowid
     conn.commit()
     conn.close()
+    return report_id
 
 def delete_history_item(item_id):
     """Delete a history item by ID."""
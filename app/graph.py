@@ -1,21 +1,21 @@
 import os
 import json
 from typing import List
+from functools import lru_cache
 from langgraph.graph import StateGraph, END
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_community.tools.tavily_search import TavilySearchResults 
 
-from app.agent_types import AgentState
-try:
-    from serpapi import GoogleSearch
-except ImportError:
-    GoogleSearch = None
+from app.agent_types import AgentState, ResearchResult
+from app.sources import to_sources
+from app.providers import get_provider
+from app.search import get_search_providers, run_search
+from app.summarize import condense_sources, format_sources
 
 def get_llm(config):
     configurable = config.get("configurable", {})
     api_key = configurable.get("gemini_api_key") or os.getenv("GEMINI_API_KEY")
     if not api_key:
         print("WARNING: Gemini API Key missing.")
+    ChatGoogleGenerativeAI = get_provider("gemini")
     return ChatGoogleGenerativeAI(
         model="gemini-2.5-flash",
         temperature=0,
@@ -25,7 +25,8 @@ def get_llm(config):
 def researcher_node(state: AgentState, config):
     """
     Research Agent: Generates search queries based on task/critique and executes them.
-    Supports "Academic Journals" mode via SerpAPI (Google Scholar).
+    Supports "Academic Journals" mode via SerpAPI (Google Scholar), and fallback,
+    hedged or merged use of the available search providers (see app/search.py).
     """
     print("--- Researcher Node Running ---")
     
@@ -82,72 +83,45 @@ def researcher_node(state: AgentState, config):
     
     clean_results: List[ResearchResult] = []
     
-    configurable = config.get("configurable", {})
-    serp_key = configurable.get("serpapi_api_key") or os.getenv("SERP_API_KEY") or os.getenv("SERPAPI_API_KEY")
-    tavily_key = configurable.get("tavily_api_key") or os.getenv("TAVILY_API_KEY")
-    max_results = configurable.get("max_results", 3)
+    providers = get_search_providers(configurable)
+    strategy = configurable.get("search_strategy", "fallback")
+    hedge_after = configurable.get("hedge_after", 1.5)
 
     for q in queries:
-        # --- Academic Search Logic (SerpAPI) ---
-        if search_mode == "Academic Journals" and serp_key and GoogleSearch:
-            print(f"DEBUG: Using SerpAPI (Google Scholar) for {q}")
-            try:
-                params = {
-                    "engine": "google_scholar",
-                    "q": q,
-                    "api_key": serp_key,
-                    "num": max_results
-                }
-                search = GoogleSearch(params)
-                results = search.get_dict().get("organic_results", [])
-                
-                for r in results:
-                    pub_info = r.get("publication_info", {})
-                    summary = pub_info.get("summary", "")
-                    
-                    import re
-                    year_match = re.search(r'\b(19|20)\d{2}\b', summary)
-                    year = year_match.group(0) if year_match else "n.d."
-                    
-                    author = summary.split("-")[0].strip() if "-" in summary else "Unknown Author"
+        clean_results.extend(run_search(q, providers, strategy=strategy, hedge_after=hedge_after))
+            
+    print(f"DEBUG: Researcher found {len(clean_results)} results")
+    return {"content": to_sources(clean_results)}
 
-                    clean_results.append({
-                        "title": r.get("title", "Unknown Title"),
-                        "year": year,
-                        "author": author,
-                        "source": r.get("link", ""),
-                        "content": r.get("snippet", "")
-                    })
-            except Exception as e:
-                print(f"SerpAPI Error: {e}. Falling back to Tavily.")
-                pass
+def summarizer_node(state: AgentState, config):
+    """
+    Summarizer Agent (optional): Map-reduce stage between researcher and writer.
+    Condenses batches of sources in parallel into short notes that keep each
+    claim's source numbers, so the writer prompt stays small for large source sets.
+    """
+    print("--- Summarizer Node Running ---")
 
-        # --- General Search Logic (Tavily) ---
-        else:
-            if search_mode == "Academic Journals" and not serp_key:
-                print("WARNING: Academic Mode selected but SERP_API_KEY missing. Falling back to Tavily.")
+    configurable = config.get("configurable", {})
+    llm = get_llm(config)
+    notes = condense_sources(
+        llm,
+        state["task"],
+        state.get("content", []),
+        batch_size=configurable.get("summary_batch_size", 8),
+        max_concurrency=configurable.get("summary_concurrency", 4)
+    )
+    return {"notes": notes}
 
-            try:
-                tavily_tool = TavilySearchResults(max_results=max_results, tavily_api_key=tavily_key)
-                
-                search_results = tavily_tool.invoke(q)
-                if search_results and isinstance(search_results, list):
-                    for result in search_results:
-                        pub_date = result.get('published_date', '')
-                        year = pub_date[:4] if pub_date else 'n.d.'
-                        
-                        clean_results.append({
-                            "title": result.get('title', 'Unknown Title'),
-                            "year": year,
-                            "author": result.get('author', 'Unknown'),
-                            "source": result.get('url', 'Unknown Source'),
-                            "content": result.get('content', '')
-                        })
-            except Exception as e:
-                print(f"Tavily Error for {q}: {e}")
-            
-    print(f"DEBUG: Researcher found {len(clean_results)} results")
-    return {"content": clean_results}
+def should_summarize(state: AgentState, config):
+    """
+    Routes to the summarizer when it is enabled and there is more than one batch of sources.
+    """
+    configurable = config.get("configurable", {})
+    if not configurable.get("summarize_sources"):
+        return "writer"
+    if len(state.get("content", [])) <= configurable.get("summary_batch_size", 8):
+        return "writer"
+    return "summarizer"
 
 def writer_node(state: AgentState, config):
     """
@@ -164,8 +138,14 @@ def writer_node(state: AgentState, config):
             "revision_number": state.get("revision_number", 0) + 1
         }
 
-    for i, result in enumerate(state["content"], 1):
-        context_string += f"[{i}] Title: {result['title']}\nAuthor: {result.get('author', 'Unknown')}\nYear: {result['year']}\nSource: {result['source']}\nContent: {result['content']}\n\n"
+    indices = list(range(1, len(state["content"]) + 1))
+    if state.get("notes"):
+        # Condensed notes from the summarizer: list the sources without their snippets
+        context_string += format_sources(indices, state["content"], with_content=False)
+        context_string += "Condensed notes (numbers refer to the sources above):\n"
+        context_string += "\n".join(state["notes"]) + "\n\n"
+    else:
+        context_string += format_sources(indices, state["content"])
     
     configurable = config.get("configurable", {})
     citation_style = configurable.get("citation_style", "IEEE")
@@ -273,23 +253,38 @@ def should_continue(state: AgentState):
     # Default: REWRITE
     return "writer"
 
-workflow = StateGraph(AgentState)
+@lru_cache(maxsize=None)
+def get_app_graph():
+    """
+    Builds and compiles the agent graph on first use (instead of at import time),
+    so the UI can render before the graph and its providers are loaded.
+    """
+    workflow = StateGraph(AgentState)
 
-workflow.add_node("researcher", researcher_node)
-workflow.add_node("writer", writer_node)
-workflow.add_node("critique", critique_node)
+    workflow.add_node("researcher", researcher_node)
+    workflow.add_node("summarizer", summarizer_node)
+    workflow.add_node("writer", writer_node)
+    workflow.add_node("critique", critique_node)
 
-workflow.set_entry_point("researcher")
-workflow.add_edge("researcher", "writer")
-workflow.add_edge("writer", "critique")
-workflow.add_conditional_edges(
-    "critique",
-    should_continue,
-    {
-        END: END, 
-        "researcher": "researcher",
-        "writer": "writer"
-    }
-)
+    workflow.set_entry_point("researcher")
+    workflow.add_conditional_edges(
+        "researcher",
+        should_summarize,
+        {
+            "summarizer": "summarizer",
+            "writer": "writer"
+        }
+    )
+    workflow.add_edge("summarizer", "writer")
+    workflow.add_edge("writer", "critique")
+    workflow.add_conditional_edges(
+        "critique",
+        should_continue,
+        {
+            END: END, 
+            "researcher": "researcher",
+            "writer": "writer"
+        }
+    )
 
-app_graph = workflow.compile()
\ No newline at end of file
+    return workflow.compile()
@@ -5,9 +5,9 @@ import sys
 # Add project root to sys.path so we can import from 'app' package
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-import pandas as pd
-from app.graph import app_graph
 from app.database import init_db, save_research, get_history, delete_history_item
+from app.sources import merge_into, to_sources
+from app.citations import CITATION_FORMATS, reference_rows, format_citations
 
 # Initialize DB on startup
 init_db()
@@ -19,6 +19,9 @@ st.markdown("""
 div[data-testid="InputInstructions"] {
     display: none;
 }
+.st-key-report .stMarkdown p {
+    text-align: justify;
+}
 </style>
 
 <div style='text-align: center; margin-bottom: 30px;'>
@@ -27,6 +30,46 @@ div[data-testid="InputInstructions"] {
 </div>
 """, unsafe_allow_html=True)
 
+# --- REPORT VIEW HELPERS ---
+# Derived data is cached per report id (and citation format), and the references
+# block is a fragment, so changing the citation format only reruns that block.
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def cached_reference_rows(report_id, _refs):
+    return reference_rows(_refs)
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def cached_citations(report_id, citation_format, _refs):
+    return format_citations(_refs, citation_format)
+
+@st.fragment
+def render_references(report_id, refs, widget_key, default_format="IEEE"):
+    st.header("References")
+
+    # 1. Table
+    st.dataframe(
+        cached_reference_rows(report_id, refs),
+        column_config={
+            "No": st.column_config.NumberColumn(width="small"),
+            "Year": st.column_config.TextColumn(width="small"),
+            "Author": "Author",
+            "Title": "Title",
+            "Source": st.column_config.LinkColumn("Link")
+        },
+        hide_index=True
+    )
+
+    st.divider()
+
+    # 2. Citation Generator
+    st.subheader("❝ Citation Generator")
+
+    default_index = CITATION_FORMATS.index(default_format) if default_format in CITATION_FORMATS else 0
+    citation_format = st.selectbox("Format", CITATION_FORMATS, index=default_index, key=widget_key)
+
+    citation_text = cached_citations(report_id, citation_format, refs)
+    st.code(citation_text, language="text" if citation_format != "BibTeX" else "latex")
+
 # --- SIDEBAR (Configuration & History) ---
 with st.sidebar:
     with st.expander("🛠 Configuration", expanded=False):
@@ -52,8 +95,14 @@ with st.sidebar:
             search_mode = st.selectbox("Search Mode", mode_options)
         
         citation_style = st.selectbox("Citation Style", ["IEEE", "APA", "BibTeX"])
+        search_strategy = st.selectbox(
+            "Provider Strategy", ["Fallback", "Hedged", "Merged"],
+            help="With both search keys: Fallback uses the second provider only on error, "
+                 "Hedged also queries it when the first is slow, Merged combines both."
+        )
         max_results = st.slider("Max Search Results", 1, 10, 3, help="Number of sources to fetch per query.")
         max_revisions = st.slider("Max Revisions", 1, 5, 2, help="Max number of critique & rewrite loops.")
+        summarize_sources = st.toggle("Condense Sources", value=False, help="Summarize sources in parallel batches before writing. Useful with many results or research loops.")
 
     st.divider()
     
@@ -74,6 +123,7 @@ with st.sidebar:
             
             with col1:
                 if st.button(label, key=f"hist_{item['id']}", help=item['topic'], use_container_width=True):
+                    item["references"] = to_sources(item.get("references", []))
                     st.session_state["history_view"] = item
                     st.rerun()
             with col2:
@@ -91,75 +141,14 @@ view_item = st.session_state.get("history_view")
 # If viewing history, show static report
 if view_item:
     st.info(f"Viewing history: {view_item['timestamp']}")
-    st.markdown("""
-    <style>
-    .stMarkdown p {
-        text-align: justify;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
-    st.markdown(view_item['report'])
+    with st.container(key="report"):
+        st.markdown(view_item['report'])
     
     st.divider()
     with st.expander("📚 References & Citations", expanded=True):
         refs = view_item.get('references', [])
         if refs:
-            st.header("References")
-            
-            # 1. Table
-            ref_data = []
-            for i, item in enumerate(refs, 1):
-                ref_data.append({
-                    "No": i,
-                    "Year": item.get("year", "n.d."),
-                    "Author": item.get("author", "Unknown"),
-                    "Title": item.get("title", 'Unknown'),
-                    "Source": item.get("source", "")
-                })
-            
-            st.dataframe(
-                ref_data, 
-                column_config={
-                    "No": st.column_config.NumberColumn(width="small"),
-                    "Year": st.column_config.TextColumn(width="small"),
-                    "Author": "Author",
-                    "Title": "Title",
-                    "Source": st.column_config.LinkColumn("Link")
-                },
-                hide_index=True
-            )
-            
-            st.divider()
-            
-            # 2. Citation Generator
-            st.subheader("❝ Citation Generator")
-            
-            citation_options = ["IEEE", "APA", "BibTeX"]
-            citation_format = st.selectbox("Format", citation_options, key="cit_history_gen")
-            
-            citation_text = ""
-            for i, item in enumerate(refs, 1):
-                title = item.get("title", "Unknown Title")
-                year = item.get("year", "n.d.")
-                author = item.get("author", "Unknown Author")
-                url = item.get("source", "")
-                
-                if citation_format == "APA":
-                    citation_text += f"{i}. {author}. ({year}). _{title}_. Retrieved from {url}\n\n"
-                elif citation_format == "IEEE":
-                    citation_text += f"[{i}]. {author}, \"{title},\" {year}. [Online]. Available: {url}.\n\n"
-                elif citation_format == "BibTeX":
-                    clean_author = author.split()[0].lower() if author else "unknown"
-                    cit_key = f"{clean_author}{year}{i}"
-                    citation_text += f"""@misc{{{cit_key},
-        author = {{{author}}},
-        title = {{{title}}},
-        year = {{{year}}},
-        howpublished = {{\\url{{{url}}}}}
-}}\n\n"""
-
-            st.code(citation_text, language="text" if citation_format != "BibTeX" else "latex")
+            render_references(view_item['id'], refs, widget_key="cit_history_gen")
         else:
             st.info("No references recorded for this item.")
         
@@ -182,6 +171,10 @@ else:
 
         status_container = st.status("Initializing Agent...", expanded=True)
         
+        # Deferred import: keeps LangGraph and the LLM/search SDKs off the first paint
+        from app.graph import get_app_graph
+        app_graph = get_app_graph()
+        
         current_state = {} 
         should_rerun = False
 
@@ -194,6 +187,8 @@ else:
                 "citation_style": citation_style,
                 "max_results": max_results,
                 "max_revisions": max_revisions,
+                "search_strategy": search_strategy.lower(),
+                "summarize_sources": summarize_sources,
                 "gemini_api_key": user_gemini_key,
                 "tavily_api_key": user_tavily_key,
                 "serpapi_api_key": user_serpapi_key
@@ -202,24 +197,27 @@ else:
             # --- AGENT LOOP ---
             for output in app_graph.stream(inputs, config=run_config):
                 for key, value in output.items():
+                    added_sources = []
                     if "content" in value and isinstance(value["content"], list):
-                        current_content = current_state.get("content", [])
-                        new_content = value["content"]
-                        current_state["content"] = current_content + new_content
+                        added_sources = merge_into(current_state, value["content"])
                         other_updates = {k: v for k, v in value.items() if k != "content"}
                         current_state.update(other_updates)
                     else:
                         current_state.update(value)
 
                     if key == "researcher":
-                        new_content = value.get('content', [])
-                        count = len(new_content)
+                        count = len(added_sources)
                         status_container.markdown(f"**Researcher**: Found {count} new articles.")
                         with status_container.expander("📄 View Collected Sources", expanded=False):
-                            for item in new_content:
+                            for item in added_sources:
                                 st.write(f"- [{item.get('year', 'n.d')}] {item.get('title', 'Unknown')}")
                         status_container.update(label="🤔 Thinking... (Writer is composing)", state="running")
                         
+                    elif key == "summarizer":
+                        batches = len(value.get('notes', []))
+                        status_container.markdown(f"**Summarizer**: Condensed sources into {batches} note batches.")
+                        status_container.update(label="🤔 Thinking... (Writer is composing)", state="running")
+                        
                     elif key == "writer":
                         rev = value.get('revision_number')
                         draft_preview = value.get('draft', '')[:300] + "..."
@@ -241,12 +239,14 @@ else:
                         status_container.update(label=f"💡 Next Action: {action}", state="running")
                         
             status_container.update(label="Research Completed!", state="complete", expanded=False)
-            st.session_state["final_state"] = current_state
             
             if current_state.get("draft"):
-                save_research(query, current_state["draft"], current_state.get("content", []))
+                current_state["report_id"] = save_research(query, current_state["draft"], [s.to_dict() for s in current_state.get("content", [])])
                 st.toast("✅ Research saved to History!")
                 should_rerun = True
+            
+            # Stored only once report_id is set, so the render below can rely on it
+            st.session_state["final_state"] = current_state
                 
             st.toast("Research completed! Scroll down for References 📚")
 
@@ -264,76 +264,14 @@ else:
         if final_state.get("draft"):
             st.divider()
             
-            # CSS for Justified Text
-            st.markdown("""
-            <style>
-            .stMarkdown p {
-                text-align: justify;
-            }
-            </style>
-            """, unsafe_allow_html=True)
-            
-            st.markdown(final_state["draft"])
+            with st.container(key="report"):
+                st.markdown(final_state["draft"])
             
             # --- REFERENCES SECTION (Bottom of Main Page) ---
             if final_state.get("content"):
                 with st.expander("📚 References & Citations", expanded=False):
-                    st.header("References")
-                    
-                    # 1. Table
-                    ref_data = []
-                    for i, item in enumerate(final_state["content"], 1):
-                        ref_data.append({
-                            "No": i,
-                            "Year": item.get("year", "n.d."),
-                            "Author": item.get("author", "Unknown"),
-                            "Title": item.get("title", 'Unknown'),
-                            "Source": item.get("source", "")
-                        })
-                    
-                    st.dataframe(
-                        ref_data, 
-                        column_config={
-                            "No": st.column_config.NumberColumn(width="small"),
-                            "Year": st.column_config.TextColumn(width="small"),
-                            "Author": "Author",
-                            "Title": "Title",
-                            "Source": st.column_config.LinkColumn("Link")
-                        },
-                        hide_index=True
+                    # Use current selectbox choice as the default format
+                    render_references(
+                        final_state["report_id"], final_state["content"],
+                        widget_key="cit_bottom_gen", default_format=citation_style
                     )
-                    
-                    st.divider()
-                    
-                    # 2. Citation Generator
-                    st.subheader("❝ Citation Generator")
-                    
-                    # Use current selectbox choice if available, else default
-                    report_style = citation_style
-                    citation_options = ["IEEE", "APA", "BibTeX"]
-                    default_index = citation_options.index(report_style) if report_style in citation_options else 0
-                    
-                    citation_format = st.selectbox("Format", citation_options, index=default_index, key="cit_bottom_gen")
-                    
-                    citation_text = ""
-                    for i, item in enumerate(final_state["content"], 1):
-                        title = item.get("title", "Unknown Title")
-                        year = item.get("year", "n.d.")
-                        author = item.get("author", "Unknown Author")
-                        url = item.get("source", "")
-                        
-                        if citation_format == "APA":
-                            citation_text += f"{i}. {author}. ({year}). _{title}_. Retrieved from {url}\n\n"
-                        elif citation_format == "IEEE":
-                            citation_text += f"[{i}]. {author}, \"{title},\" {year}. [Online]. Available: {url}.\n\n"
-                        elif citation_format == "BibTeX":
-                            clean_author = author.split()[0].lower() if author else "unknown"
-                            cit_key = f"{clean_author}{year}{i}"
-                            citation_text += f"""@misc{{{cit_key},
-        author = {{{author}}},
-        title = {{{title}}},
-        year = {{{year}}},
-        howpublished = {{\\url{{{url}}}}}
-}}\n\n"""
-
-                    st.code(citation_text, language="text" if citation_format != "BibTeX" else "latex")
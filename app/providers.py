@@ -0,0 +1,33 @@
+import importlib
+
+# Provider name -> (module, attribute, optional).
+# Modules are imported on first use, so the heavy LLM / search SDKs stay off the
+# app's startup path. Optional providers resolve to None when not installed.
+_REGISTRY = {
+    "gemini": ("langchain_google_genai", "ChatGoogleGenerativeAI", False),
+    "tavily": ("langchain_community.tools.tavily_search", "TavilySearchResults", False),
+    "serpapi": ("serpapi", "GoogleSearch", True),
+}
+
+_loaded = {}
+
+def register_provider(name, module, attribute, optional=False):
+    """Register (or override) a lazily imported provider class."""
+    _REGISTRY[name] = (module, attribute, optional)
+    _loaded.pop(name, None)
+
+def get_provider(name):
+    """Import and return the provider class for `name`, caching it after the first call."""
+    if name in _loaded:
+        return _loaded[name]
+
+    module_name, attribute, optional = _REGISTRY[name]
+    try:
+        provider = getattr(importlib.import_module(module_name), attribute)
+    except ImportError:
+        if not optional:
+            raise
+        provider = None
+
+    _loaded[name] = provider
+    return provider
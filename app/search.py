@@ -0,0 +1,211 @@
+import os
+import re
+import time
+from typing import List
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from app.agent_types import ResearchResult
+from app.providers import get_provider
+
+def normalize_result(title=None, year=None, author=None, source=None, content=None) -> ResearchResult:
+    """Common ResearchResult shape for every provider, with the usual placeholders."""
+    return {
+        "title": title or "Unknown Title",
+        "year": year or "n.d.",
+        "author": author or "Unknown",
+        "source": source or "",
+        "content": content or ""
+    }
+
+class SearchProvider:
+    """
+    Base class for search backends.
+    Subclasses implement `fetch` (raw API call) and `normalize` (one raw hit -> ResearchResult).
+    """
+    name = "base"
+
+    def __init__(self, api_key, max_results=3):
+        self.api_key = api_key
+        self.max_results = max_results
+
+    def is_available(self):
+        return bool(self.api_key)
+
+    def fetch(self, query) -> list:
+        raise NotImplementedError
+
+    def normalize(self, raw) -> ResearchResult:
+        raise NotImplementedError
+
+    def search(self, query) -> List[ResearchResult]:
+        return [self.normalize(r) for r in self.fetch(query)]
+
+class TavilyProvider(SearchProvider):
+    """General web search via Tavily."""
+    name = "Tavily"
+
+    def fetch(self, query):
+        TavilySearchResults = get_provider("tavily")
+        tavily_tool = TavilySearchResults(max_results=self.max_results, tavily_api_key=self.api_key)
+        results = tavily_tool.invoke(query)
+        # The langchain tool reports API errors by returning repr(error) instead of raising
+        if isinstance(results, str):
+            raise RuntimeError(results)
+        return results if isinstance(results, list) else []
+
+    def normalize(self, raw):
+        pub_date = raw.get('published_date', '')
+        return normalize_result(
+            title=raw.get('title'),
+            year=pub_date[:4] if pub_date else None,
+            author=raw.get('author'),
+            source=raw.get('url', 'Unknown Source'),
+            content=raw.get('content')
+        )
+
+class ScholarProvider(SearchProvider):
+    """Academic search via SerpAPI (Google Scholar)."""
+    name = "SerpAPI"
+
+    def is_available(self):
+        return bool(self.api_key) and get_provider("serpapi") is not None
+
+    def fetch(self, query):
+        GoogleSearch = get_provider("serpapi")
+        params = {
+            "engine": "google_scholar",
+            "q": query,
+            "api_key": self.api_key,
+            "num": self.max_results
+        }
+        return GoogleSearch(params).get_dict().get("organic_results", [])
+
+    def normalize(self, raw):
+        summary = raw.get("publication_info", {}).get("summary", "")
+        year_match = re.search(r'\b(19|20)\d{2}\b', summary)
+        return normalize_result(
+            title=raw.get("title"),
+            year=year_match.group(0) if year_match else None,
+            author=summary.split("-")[0].strip() if "-" in summary else "Unknown Author",
+            source=raw.get("link"),
+            content=raw.get("snippet")
+        )
+
+def get_search_providers(configurable) -> List[SearchProvider]:
+    """
+    Available providers for a run, primary first.
+    Academic mode prefers Google Scholar; General mode prefers Tavily.
+    """
+    serp_key = configurable.get("serpapi_api_key") or os.getenv("SERP_API_KEY") or os.getenv("SERPAPI_API_KEY")
+    tavily_key = configurable.get("tavily_api_key") or os.getenv("TAVILY_API_KEY")
+    max_results = configurable.get("max_results", 3)
+
+    tavily = TavilyProvider(tavily_key, max_results)
+    scholar = ScholarProvider(serp_key, max_results)
+
+    if configurable.get("search_mode", "General") == "Academic Journals":
+        if not scholar.is_available():
+            print("WARNING: Academic Mode selected but SerpAPI is unavailable. Falling back to Tavily.")
+        ordered = [scholar, tavily]
+    else:
+        ordered = [tavily, scholar]
+    return [p for p in ordered if p.is_available()]
+
+def _dedup_key(result):
+    url = (result.get("source") or "").lower().split("://", 1)[-1]
+    url = url.removeprefix("www.").rstrip("/")
+    if url and url != "unknown source":
+        return "url:" + url
+    return "title:" + re.sub(r"\W+", " ", result.get("title", "").lower()).strip()
+
+def merge_results(result_lists) -> List[ResearchResult]:
+    """Concatenates provider results in order, dropping hits that point to the same URL (or title)."""
+    merged, seen = [], set()
+    for results in result_lists:
+        for result in results:
+            key = _dedup_key(result)
+            if key not in seen:
+                seen.add(key)
+                merged.append(result)
+    return merged
+
+def _search_logged(provider, query):
+    print(f"DEBUG: Using {provider.name} for {query}")
+    try:
+        return provider.search(query)
+    except Exception as e:
+        print(f"{provider.name} Error for {query}: {e}")
+        raise
+
+def search_fallback(query, providers):
+    """Sequential: use the first provider that answers without error."""
+    for provider in providers:
+        try:
+            return _search_logged(provider, query)
+        except Exception:
+            continue
+    return []
+
+def _make_executor(providers):
+    # One pool per call, sized to the providers, so a request never queues behind
+    # other sessions' slow or abandoned requests. Shut down with
+    # shutdown(wait=False, cancel_futures=True): a losing request is not waited on,
+    # it finishes in the background and its results are discarded.
+    return ThreadPoolExecutor(max_workers=len(providers), thread_name_prefix="search")
+
+def search_hedged(query, providers, hedge_after=1.5):
+    """
+    Sends the query to the primary provider and, if it hasn't answered within
+    `hedge_after` seconds (or fails, or answers with no results), to the next one
+    as well. Returns the first non-empty answer; the slower request is cancelled
+    if still queued, otherwise left to finish and discarded.
+    """
+    executor = _make_executor(providers)
+    pending = {}
+    remaining = list(providers)
+    deadline = None
+
+    try:
+        while remaining or pending:
+            if remaining and (not pending or time.monotonic() >= deadline):
+                provider = remaining.pop(0)
+                pending[executor.submit(_search_logged, provider, query)] = provider
+                deadline = time.monotonic() + hedge_after
+
+            timeout = max(0.0, deadline - time.monotonic()) if remaining else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                provider = pending.pop(future)
+                # An empty answer only wins if no other provider can still answer
+                if future.exception() is None and future.result():
+                    print(f"DEBUG: Hedged search answered by {provider.name}")
+                    return future.result()
+        return []
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def search_merged(query, providers):
+    """Queries all providers concurrently and merges their results with cross-provider dedup."""
+    executor = _make_executor(providers)
+    try:
+        futures = [executor.submit(_search_logged, p, query) for p in providers]
+        result_lists = []
+        for future in futures:
+            try:
+                result_lists.append(future.result())
+            except Exception:
+                pass
+        return merge_results(result_lists)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def run_search(query, providers, strategy="fallback", hedge_after=1.5) -> List[ResearchResult]:
+    """Runs one query with the given strategy: "fallback", "hedged" or "merged"."""
+    if not providers:
+        print("WARNING: No search provider available.")
+        return []
+    if strategy == "hedged":
+        return search_hedged(query, providers, hedge_after)
+    if strategy == "merged":
+        return search_merged(query, providers)
+    return search_fallback(query, providers)
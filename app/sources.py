@@ -0,0 +1,146 @@
+import sys
+import hashlib
+import weakref
+from typing import List, Iterable
+
+_FIELDS = ("title", "year", "author", "source", "content")
+
+
+class Source:
+    """
+    Compact, immutable research source.
+    Uses __slots__ instead of a per-instance dict, and interns the short metadata
+    strings (title/year/author/url) which repeat heavily across queries and sessions.
+    Supports dict-style reads (item["title"], item.get("year")) so it can be used
+    anywhere a ResearchResult dict was used before.
+    """
+    __slots__ = ("key", "title", "year", "author", "source", "content", "__weakref__")
+
+    def __init__(self, key, title, year, author, source, content):
+        object.__setattr__(self, "key", key)
+        object.__setattr__(self, "title", sys.intern(title))
+        object.__setattr__(self, "year", sys.intern(year))
+        object.__setattr__(self, "author", sys.intern(author))
+        object.__setattr__(self, "source", sys.intern(source))
+        object.__setattr__(self, "content", content)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Source is immutable")
+
+    def __reduce__(self):
+        # Unpickling goes back through the shared store, so it stays deduplicated
+        return (_restore_source, (self.to_dict(),))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __getitem__(self, name):
+        if name not in _FIELDS:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def get(self, name, default=None):
+        if name not in _FIELDS:
+            return default
+        return getattr(self, name)
+
+    def __contains__(self, name):
+        return name in _FIELDS
+
+    def to_dict(self) -> dict:
+        """Plain dict copy, e.g. for JSON serialization."""
+        return {name: getattr(self, name) for name in _FIELDS}
+
+    def __repr__(self):
+        return f"Source(key={self.key!r}, title={self.title!r})"
+
+
+def source_key(result) -> str:
+    """Stable hash identifying a source by its URL, title and snippet."""
+    raw = "\x1f".join(str(result.get(name) or "") for name in ("source", "title", "content"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class SourceStore:
+    """
+    Process-wide store of Source records, shared by all sessions.
+    Identical results (same URL/title/snippet) resolve to a single Source object,
+    so graph state and st.session_state only hold references to it.
+    Entries are weakly held and disappear once no session references them.
+    """
+
+    def __init__(self):
+        self._sources = weakref.WeakValueDictionary()
+
+    def add(self, result) -> Source:
+        if isinstance(result, Source):
+            return result
+        key = source_key(result)
+        existing = self._sources.get(key)
+        if existing is not None:
+            return existing
+        source = Source(
+            key,
+            str(result.get("title") or "Unknown Title"),
+            str(result.get("year") or "n.d."),
+            str(result.get("author") or "Unknown"),
+            str(result.get("source") or ""),
+            str(result.get("content") or ""),
+        )
+        self._sources[key] = source
+        return source
+
+    def get(self, key):
+        return self._sources.get(key)
+
+    def __len__(self):
+        return len(self._sources)
+
+
+source_store = SourceStore()
+
+
+def _restore_source(result) -> Source:
+    return source_store.add(result)
+
+
+def to_sources(results: Iterable) -> List[Source]:
+    """Resolve raw result dicts to shared Source references."""
+    return [source_store.add(r) for r in results]
+
+
+def _new_unique(current: List[Source], new: Iterable) -> List[Source]:
+    """Sources from `new` not already in `current` (or earlier in `new`)."""
+    seen = {s.key for s in current}
+    added = []
+    for item in new:
+        source = source_store.add(item)
+        if source.key not in seen:
+            seen.add(source.key)
+            added.append(source)
+    return added
+
+
+def merge_sources(current: List[Source], new: List[Source]) -> List[Source]:
+    """
+    State reducer for AgentState.content.
+    Returns a new list with the sources not already collected by an earlier research pass.
+    """
+    current = current or []
+    if not new:
+        return current
+    return current + _new_unique(current, new)
+
+
+def merge_into(state: dict, new: List[Source]) -> List[Source]:
+    """
+    Merge new sources into a plain state dict in place (used by the UI stream loop).
+    Returns the sources that were actually added.
+    """
+    current = state.setdefault("content", [])
+    added = _new_unique(current, new)
+    current.extend(added)
+    return added
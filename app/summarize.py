@@ -0,0 +1,122 @@
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+
+from app.sources import source_key
+
+# Condensed notes keyed by batch hash. Sources only ever get appended to the state,
+# so after a RESEARCH_MORE loop the earlier batches hash the same and are reused.
+_NOTE_CACHE_SIZE = 512
+_note_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def make_batches(sources, batch_size=8):
+    """Groups sources into (global 1-based indices, sources) batches, in order."""
+    batches = []
+    for start in range(0, len(sources), batch_size):
+        chunk = sources[start:start + batch_size]
+        batches.append((list(range(start + 1, start + 1 + len(chunk))), chunk))
+    return batches
+
+def batch_key(task, indices, sources):
+    """
+    Hash of the task plus a batch's source hashes and positions
+    (positions are baked into the notes' citation numbers).
+    """
+    raw = task + "|" + "|".join(f"{i}:{getattr(s, 'key', None) or source_key(s)}" for i, s in zip(indices, sources))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def format_sources(indices, sources, with_content=True):
+    text = ""
+    for i, result in zip(indices, sources):
+        text += f"[{i}] Title: {result['title']}\nAuthor: {result.get('author', 'Unknown')}\nYear: {result['year']}\nSource: {result['source']}\n"
+        if with_content:
+            text += f"Content: {result['content']}\n"
+        text += "\n"
+    return text
+
+def batch_prompt(task, indices, sources):
+    return f"""
+    You are a research assistant condensing sources for a report on: {task}
+
+    Sources:
+    {format_sources(indices, sources)}
+
+    Extract the key facts, figures and findings relevant to the report as short bullet points.
+    End EVERY bullet with the number(s) of the source(s) supporting it, e.g. "- Claim text [{indices[0]}]".
+    Only use the source numbers listed above. Skip anything irrelevant.
+
+    Return ONLY the bullet points.
+    """
+
+def keep_valid_citations(notes, indices):
+    """Drops citation numbers that don't belong to the batch, so notes can't cite the wrong source."""
+    allowed = set(indices)
+
+    first, last = min(indices), max(indices)
+
+    def _filter(match):
+        numbers = []
+        for part in match.group(0)[1:-1].split(","):
+            try:
+                bounds = [int(n) for n in part.split("-")]
+            except ValueError:
+                continue
+            if len(bounds) == 1:
+                cited = bounds
+            elif len(bounds) == 2:
+                # Expand ranges like [3-5] (or [5-3]), clipped to the batch
+                lo, hi = sorted(bounds)
+                cited = range(max(lo, first), min(hi, last) + 1)
+            else:
+                # Malformed group such as [3-5-7]
+                continue
+            numbers.extend(str(n) for n in cited if n in allowed and str(n) not in numbers)
+        return f"[{', '.join(numbers)}]" if numbers else ""
+
+    notes = re.sub(r"\[\d+(?:\s*[,-]\s*\d+)*\]", _filter, notes)
+    return re.sub(r"[ \t]+$", "", notes, flags=re.MULTILINE)
+
+def get_cached_notes(key):
+    with _cache_lock:
+        notes = _note_cache.get(key)
+        if notes is not None:
+            _note_cache.move_to_end(key)
+        return notes
+
+def cache_notes(key, notes):
+    with _cache_lock:
+        _note_cache[key] = notes
+        _note_cache.move_to_end(key)
+        while len(_note_cache) > _NOTE_CACHE_SIZE:
+            _note_cache.popitem(last=False)
+
+def condense_sources(llm, task, sources, batch_size=8, max_concurrency=4):
+    """
+    Map step: condenses each batch of sources into cited bullet notes, running
+    uncached batches in parallel (at most `max_concurrency` LLM calls at once).
+    A batch whose call fails falls back to its raw snippets.
+    Returns one notes string per batch, in source order.
+    """
+    batches = make_batches(sources, batch_size)
+    keys = [batch_key(task, indices, chunk) for indices, chunk in batches]
+    notes = [get_cached_notes(k) for k in keys]
+
+    missing = [n for n, cached in enumerate(notes) if cached is None]
+    print(f"DEBUG: Summarizer has {len(batches)} batches, {len(batches) - len(missing)} cached")
+    if missing:
+        prompts = [batch_prompt(task, *batches[n]) for n in missing]
+        responses = llm.batch(prompts, config={"max_concurrency": max_concurrency}, return_exceptions=True)
+        for n, response in zip(missing, responses):
+            indices, chunk = batches[n]
+            try:
+                if isinstance(response, Exception):
+                    raise response
+                notes[n] = keep_valid_citations(response.content.strip(), indices)
+            except Exception as e:
+                print(f"Summarizer Error for sources {indices[0]}-{indices[-1]}: {e}")
+                notes[n] = format_sources(indices, chunk)
+                continue
+            cache_notes(keys[n], notes[n])
+    return notes
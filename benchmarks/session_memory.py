@@ -0,0 +1,111 @@
+"""
+Per-session memory footprint of collected research sources.
+
+Compares the original representation (a fresh dict per result, list concatenation
+on every streamed update) against shared Source references merged in place.
+
+Two scenarios:
+- distinct: every session collects its own, non-repeating sources, so both sides
+  hold the same number of sources and the difference is the record layout only.
+- overlapping: sessions research overlapping topics drawn from one pool, which
+  adds the effect of deduplication and cross-session sharing.
+
+Usage:
+    python benchmarks/session_memory.py [--sessions 20] [--passes 1 3 5 10]
+"""
+import os
+import sys
+import random
+import argparse
+import tracemalloc
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.sources import merge_into, to_sources
+
+SNIPPET = "Solid state batteries replace the liquid electrolyte with a solid one. " * 6
+
+
+def make_result(i):
+    return {
+        "title": f"Advances in solid state battery research, part {i}",
+        "year": str(2015 + i % 10),
+        "author": f"Author {i % 40}",
+        "source": f"https://example.org/papers/{i}",
+        "content": f"{SNIPPET} ({i})",
+    }
+
+
+def overlapping_passes(session, passes, per_pass, pool_size):
+    """Yields raw result batches drawn from a shared pool, as a researcher node would return them."""
+    rng = random.Random(session)
+    for _ in range(passes):
+        yield [make_result(rng.randrange(pool_size)) for _ in range(per_pass)]
+
+
+def distinct_passes(session, passes, per_pass, pool_size=None):
+    """Yields raw result batches that never repeat, within or across sessions."""
+    base = session * 1_000_000
+    for p in range(passes):
+        yield [make_result(base + p * per_pass + k) for k in range(per_pass)]
+
+
+def run_dict_sessions(batches, sessions, passes, per_pass, pool_size):
+    states = []
+    for s in range(sessions):
+        state = {}
+        for batch in batches(s, passes, per_pass, pool_size):
+            state["content"] = state.get("content", []) + batch
+        states.append(state)
+    return states
+
+
+def run_source_sessions(batches, sessions, passes, per_pass, pool_size):
+    states = []
+    for s in range(sessions):
+        state = {}
+        for batch in batches(s, passes, per_pass, pool_size):
+            merge_into(state, to_sources(batch))
+        states.append(state)
+    return states
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    states = fn(*args)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n_sources = sum(len(st["content"]) for st in states) / len(states)
+    del states
+    return current, peak, n_sources
+
+
+def report(title, batches, args):
+    print(title)
+    print(f"{'passes':>6} | {'dict sources':>12} {'KiB/session':>11} {'B/source':>8} {'peak KiB':>8} | "
+          f"{'Source sources':>14} {'KiB/session':>11} {'B/source':>8} {'peak KiB':>8}")
+    for passes in args.passes:
+        row = f"{passes:>6} |"
+        for fn, width in ((run_dict_sessions, 12), (run_source_sessions, 14)):
+            current, peak, n = measure(fn, batches, args.sessions, passes, args.per_pass, args.pool)
+            per_session = current / args.sessions
+            row += f" {n:>{width}.1f} {per_session / 1024:>11.1f} {per_session / n:>8.0f} {peak / 1024:>8.0f} |"
+        print(row.rstrip(" |"))
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--per-pass", type=int, default=9, help="Results per research pass (3 queries x max_results)")
+    parser.add_argument("--pool", type=int, default=60, help="Distinct sources available for the overlapping topic")
+    parser.add_argument("--passes", type=int, nargs="+", default=[1, 3, 5, 10])
+    args = parser.parse_args()
+
+    print(f"{args.sessions} sessions, {args.per_pass} results/pass\n")
+    report("distinct sources per session (same source count on both sides)", distinct_passes, args)
+    report(f"overlapping topics (shared pool of {args.pool} sources, includes dedup + sharing)", overlapping_passes, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Startup timing: cold import of the modules needed for first paint vs. the agent
+graph, each measured in a fresh interpreter so nothing is cached in sys.modules.
+
+Also times a full first run of app/main.py through Streamlit's AppTest harness
+(no browser), which approximates the time to first paint of a new session.
+
+Usage:
+    python benchmarks/startup_time.py [--repeat 5]
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+SCENARIOS = {
+    # What a new Streamlit process needs before the page can render
+    "first paint imports": "import streamlit, app.database, app.sources, app.citations",
+    # Deferred until the first "Start Research" click
+    "agent graph import": "import app.graph",
+    "agent graph build": "import app.graph; app.graph.get_app_graph()",
+    "providers load": "from app.providers import get_provider; [get_provider(p) for p in ('gemini', 'tavily', 'serpapi')]",
+}
+
+FIRST_PAINT = """
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app/main.py", default_timeout=120)
+at.run()
+assert not at.exception, at.exception
+"""
+
+TIMER = """
+import json, sys, time
+start = time.perf_counter()
+exec(compile(sys.argv[1], "<bench>", "exec"))
+print(json.dumps(time.perf_counter() - start))
+"""
+
+
+def time_snippet(code):
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONDONTWRITEBYTECODE="")
+    proc = subprocess.run(
+        [sys.executable, "-c", TIMER, code],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        return None, proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"
+    return json.loads(proc.stdout.strip().splitlines()[-1]), None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    scenarios = dict(SCENARIOS, **{"first paint (AppTest run)": FIRST_PAINT})
+
+    print(f"{'scenario':<28} {'median s':>9} {'min s':>9}")
+    for name, code in scenarios.items():
+        timings, error = [], None
+        for _ in range(args.repeat):
+            elapsed, error = time_snippet(code)
+            if error:
+                break
+            timings.append(elapsed)
+        if error:
+            print(f"{name:<28} {'skipped':>9}  ({error})")
+        else:
+            print(f"{name:<28} {statistics.median(timings):>9.3f} {min(timings):>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import time
+import threading
+
+import app.providers
+from app.search import SearchProvider, TavilyProvider, ScholarProvider, normalize_result, run_search
+
+
+class FakeProvider(SearchProvider):
+    """Provider with a canned raw API response, going through fetch/normalize like the real ones."""
+
+    def __init__(self, name, delay, fail=False, raw=None):
+        super().__init__(api_key="test")
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.raw = raw
+
+    def fetch(self, query):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("provider error")
+        if self.raw is not None:
+            return self.raw
+        return [{"title": f"{self.name} result", "url": f"https://{self.name}.example/{query}"}]
+
+    def normalize(self, raw):
+        return normalize_result(title=raw.get("title"), source=raw.get("url"))
+
+
+class FakeTavilyTool:
+    response = []
+
+    def __init__(self, max_results, tavily_api_key):
+        pass
+
+    def invoke(self, query):
+        return self.response
+
+
+class FakeGoogleSearch:
+    response = {}
+
+    def __init__(self, params):
+        pass
+
+    def get_dict(self):
+        return self.response
+
+
+def test_tavily_normalizes_fields(monkeypatch):
+    monkeypatch.setitem(app.providers._loaded, "tavily", FakeTavilyTool)
+    monkeypatch.setattr(FakeTavilyTool, "response", [
+        {"title": "Paper", "url": "https://a.example", "content": "text", "published_date": "2021-04-02"},
+        {"url": "https://b.example"},
+    ])
+
+    results = TavilyProvider("key").search("q")
+
+    assert results == [
+        {"title": "Paper", "year": "2021", "author": "Unknown", "source": "https://a.example", "content": "text"},
+        {"title": "Unknown Title", "year": "n.d.", "author": "Unknown", "source": "https://b.example", "content": ""},
+    ]
+
+
+def test_scholar_normalizes_fields(monkeypatch):
+    monkeypatch.setitem(app.providers._loaded, "serpapi", FakeGoogleSearch)
+    monkeypatch.setattr(FakeGoogleSearch, "response", {"organic_results": [{
+        "title": "Study",
+        "link": "https://s.example",
+        "snippet": "abstract",
+        "publication_info": {"summary": "J Doe, A Roe - Journal of Things, 2019 - example.org"},
+    }]})
+
+    results = ScholarProvider("key").search("q")
+
+    assert results == [
+        {"title": "Study", "year": "2019", "author": "J Doe, A Roe", "source": "https://s.example", "content": "abstract"},
+    ]
+
+
+def test_tavily_string_error_falls_back_to_next_provider(monkeypatch):
+    monkeypatch.setitem(app.providers._loaded, "tavily", FakeTavilyTool)
+    monkeypatch.setattr(FakeTavilyTool, "response", "HTTPError('401 Client Error: Unauthorized')")
+    providers = [TavilyProvider("key"), FakeProvider("backup", 0.0)]
+
+    assert run_search("q", providers, strategy="fallback")[0]["title"] == "backup result"
+    assert run_search("q", providers, strategy="hedged", hedge_after=5.0)[0]["title"] == "backup result"
+    assert [r["title"] for r in run_search("q", providers, strategy="merged")] == ["backup result"]
+
+
+def test_hedged_empty_answer_does_not_win():
+    providers = [FakeProvider("empty", 0.0, raw=[]), FakeProvider("slow", 0.2)]
+    results = run_search("q", providers, strategy="hedged", hedge_after=5.0)
+    assert results[0]["title"] == "slow result"
+
+    # Empty is still returned when no provider has anything
+    assert run_search("q", [FakeProvider("a", 0.0, raw=[]), FakeProvider("b", 0.0, raw=[])], strategy="hedged") == []
+
+
+def test_hedged_returns_faster_provider():
+    primary = FakeProvider("slow", 2.0)
+    secondary = FakeProvider("fast", 0.05)
+
+    start = time.monotonic()
+    results = run_search("q", [primary, secondary], strategy="hedged", hedge_after=0.2)
+
+    assert results[0]["title"] == "fast result"
+    assert time.monotonic() - start < 1.0
+
+
+def test_hedged_not_delayed_by_saturated_searches():
+    # Other sessions' slow searches (including abandoned hedges) must not queue
+    # a new request behind them.
+    background = [
+        threading.Thread(
+            target=run_search,
+            args=("busy", [FakeProvider("a", 3.0), FakeProvider("b", 3.0)]),
+            kwargs={"strategy": strategy, "hedge_after": 0.01},
+            daemon=True,
+        )
+        for strategy in ("hedged", "merged")
+        for _ in range(8)
+    ]
+    for thread in background:
+        thread.start()
+    time.sleep(0.1)
+
+    start = time.monotonic()
+    results = run_search("q", [FakeProvider("primary", 0.1), FakeProvider("secondary", 3.0)],
+                         strategy="hedged", hedge_after=0.5)
+
+    assert results[0]["title"] == "primary result"
+    assert time.monotonic() - start < 1.0
+
+
+def test_hedged_falls_through_on_error():
+    results = run_search("q", [FakeProvider("broken", 0.0, fail=True), FakeProvider("ok", 0.05)],
+                         strategy="hedged", hedge_after=5.0)
+    assert results[0]["title"] == "ok result"
+
+
+def test_merged_dedups_across_providers():
+    same = [{"title": "same", "url": "https://www.example.com/paper/"}]
+    providers = [FakeProvider("a", 0, raw=same), FakeProvider("b", 0, raw=same), FakeProvider("c", 0)]
+
+    results = run_search("q", providers, strategy="merged")
+
+    assert [r["title"] for r in results] == ["same", "c result"]
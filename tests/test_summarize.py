@@ -0,0 +1,51 @@
+from app.summarize import condense_sources, keep_valid_citations
+
+
+def test_keeps_only_batch_citations():
+    notes = "- claim [1]\n- other [9, 3]\n- stray [99]"
+    assert keep_valid_citations(notes, [1, 2, 3]) == "- claim [1]\n- other [3]\n- stray"
+
+
+def test_expands_citation_ranges():
+    assert keep_valid_citations("- claim [3-5]", [3, 4, 5]) == "- claim [3, 4, 5]"
+    assert keep_valid_citations("- claim [1, 4-7]", [4, 5, 6]) == "- claim [4, 5, 6]"
+
+
+def test_ranges_are_clipped_to_batch():
+    assert keep_valid_citations("- claim [1-20]", list(range(1, 9))) == "- claim [1, 2, 3, 4, 5, 6, 7, 8]"
+    assert keep_valid_citations("- claim [7-12]", list(range(9, 17))) == "- claim [9, 10, 11, 12]"
+
+
+def test_reversed_range_is_expanded():
+    assert keep_valid_citations("- claim [5-3]", [3, 4, 5]) == "- claim [3, 4, 5]"
+
+
+def test_malformed_group_is_skipped():
+    assert keep_valid_citations("- claim [3-5-7]", [3, 4, 5]) == "- claim"
+    assert keep_valid_citations("- claim [3-5-7, 4]", [3, 4, 5]) == "- claim [4]"
+
+
+class _Response:
+    def __init__(self, content):
+        self.content = content
+
+
+class _FakeLLM:
+    def __init__(self, responses):
+        self.responses = responses
+
+    def batch(self, prompts, config=None, return_exceptions=False):
+        return self.responses[:len(prompts)]
+
+
+def test_condense_falls_back_to_snippets_on_failed_batch():
+    sources = [
+        {"title": f"t{i}", "year": "2020", "author": "a", "source": f"https://x.example/{i}", "content": f"snippet {i}"}
+        for i in range(4)
+    ]
+    llm = _FakeLLM([_Response("- claim [1, 2]"), RuntimeError("quota")])
+
+    notes = condense_sources(llm, "fallback task", sources, batch_size=2)
+
+    assert notes[0] == "- claim [1, 2]"
+    assert "Content: snippet 3" in notes[1]